@@ -0,0 +1,46 @@
+import os
+import multiprocessing
+
+def _parse_cpu_list(text):
+    cpus = set()
+    for part in text.strip().split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            cpus.update(range(int(start), int(end) + 1))
+        elif part:
+            cpus.add(int(part))
+    return cpus
+
+def physical_core_cpus():
+    """
+    Return one logical CPU per physical core from this process's affinity mask
+    
+    SMT siblings are read from sysfs, so this is only available on Linux.
+    Returns None when the CPU topology cannot be determined.
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    allowed = os.sched_getaffinity(0)
+    selected = set()
+    for cpu in allowed:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list") as f:
+                siblings = _parse_cpu_list(f.read())
+        except (OSError, ValueError):
+            return None
+        selected.add(min(siblings & allowed))
+    return selected
+
+def physical_cpu_count():
+    """Number of physical CPU cores available to this process (SMT siblings counted once)"""
+    cpus = physical_core_cpus()
+    if cpus:
+        return len(cpus)
+    try:
+        import psutil
+        count = psutil.cpu_count(logical=False)
+        if count:
+            return count
+    except ImportError:
+        pass
+    return multiprocessing.cpu_count()
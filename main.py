@@ -1,425 +1,1495 @@
-import os
-import sys
-import numpy as np
-from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip, concatenate_videoclips, AudioFileClip
-from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
-import whisper
-import tempfile
-import torch  
-import shutil
-from pathlib import Path
-from moviepy.config import change_settings
-
-
-def configure_imagemagick():
-    """Configure ImageMagick path properly"""
-    potential_paths = [
-        r"C:\Program Files\ImageMagick-7.1.1-Q16-HDRI\magick.exe",
-        r"C:\Program Files\ImageMagick-7.1.1-Q16\magick.exe",
-        r"C:\Program Files\ImageMagick-7.1.1-Q16-HDRI\convert.exe",
-        r"C:\Program Files\ImageMagick-7.1.1-Q16\convert.exe",
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), "ImageMagick-7.1.1-Q16-HDRI", "magick.exe"),
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), "ImageMagick", "magick.exe"),
-    ]
-    
-    existing_paths = [p for p in potential_paths if os.path.exists(p)]
-    
-    if existing_paths:
-        im_path = existing_paths[0]
-        print(f"Found ImageMagick at: {im_path}")
-        change_settings({"IMAGEMAGICK_BINARY": im_path})
-        return True
-    else:
-        print("Warning: ImageMagick not found in common locations")
-        try:
-            import subprocess
-            result = subprocess.run(["where", "magick"], capture_output=True, text=True)
-            if result.returncode == 0 and result.stdout.strip():
-                path = result.stdout.strip().split('\n')[0]
-                print(f"Found ImageMagick in PATH: {path}")
-                change_settings({"IMAGEMAGICK_BINARY": path})
-                return True
-        except Exception as e:
-            print(f"Error finding ImageMagick in PATH: {e}")
-        
-        print("ERROR: ImageMagick not found. Subtitles may not render correctly.")
-        print("Please install ImageMagick from: https://imagemagick.org/script/download.php")
-        print("  ... or continue without proper text rendering")
-        return False
-
-configure_imagemagick()
-
-def detect_speech_segments(audio_path, min_silence_len=700, silence_thresh=-35, context_ms=300, pause_ms=500):
-    """
-    Detect non-silent parts of the audio with added context and smooth transitions
-    
-    Args:
-        audio_path: Path to audio file
-        min_silence_len: Minimum silence length in milliseconds
-        silence_thresh: Audio level (in dB) below which is considered silence
-        context_ms: Milliseconds of context to add before each speech segment
-        pause_ms: Milliseconds of silence to retain at the end of each segment
-    """
-    audio = AudioSegment.from_file(audio_path)
-    
-    non_silent_chunks = detect_nonsilent(
-        audio, 
-        min_silence_len=min_silence_len,
-        silence_thresh=silence_thresh
-    )
-    
-    non_silent_ranges = []
-    for start, end in non_silent_chunks:
-        context_start = max(0, start - context_ms)
-        
-        extended_end = end + pause_ms
-        
-        non_silent_ranges.append((context_start/1000, extended_end/1000))
-    
-    merged_ranges = []
-    if non_silent_ranges:
-        current_start, current_end = non_silent_ranges[0]
-        for start, end in non_silent_ranges[1:]:
-            if start <= current_end:
-                current_end = max(current_end, end)
-            else:
-                if (start - current_end) * 1000 > (min_silence_len - pause_ms - context_ms):
-                    merged_ranges.append((current_start, current_end))
-                    current_start, current_end = start, end
-                else:
-                    current_end = end
-        merged_ranges.append((current_start, current_end))
-    
-    print(f"Found {len(merged_ranges)} speech segments after merging overlaps and adding smooth transitions")
-    return merged_ranges
-
-def transcribe_audio(audio_path, use_gpu=True):
-    """Transcribe audio using Whisper with GPU if available"""
-    print("Loading Whisper model...")
-    
-    if use_gpu:
-        try:
-            if torch.cuda.is_available():
-                device = "cuda"
-                torch.cuda.init()
-                print(f"Using GPU: {torch.cuda.get_device_name(0)}")
-                print(f"CUDA Version: {torch.version.cuda}")
-                print(f"GPU Memory: {torch.cuda.get_device_properties(0).total_memory / 1e9:.2f} GB")
-            else:
-                device = "cpu"
-                print("CUDA is not available. Using CPU for transcription.")
-                print(f"PyTorch version: {torch.__version__}")
-        except Exception as e:
-            device = "cpu"
-            print(f"Error initializing GPU: {str(e)}")
-            print("Falling back to CPU for transcription.")
-    else:
-        device = "cpu"
-        print("GPU usage disabled. Using CPU for transcription.")
-    
-    try:
-        model = whisper.load_model("base", device=device)
-        print(f"Model loaded successfully on {device}")
-        
-        print("Transcribing audio...")
-        result = model.transcribe(audio_path, language="en")
-        
-        return result["segments"]
-    except Exception as e:
-        print(f"Error during transcription: {str(e)}")
-        if device == "cuda":
-            print("Attempting fallback to CPU...")
-            try:
-                model = whisper.load_model("base", device="cpu")
-                result = model.transcribe(audio_path, language="en")
-                return result["segments"]
-            except Exception as e2:
-                print(f"CPU fallback also failed: {str(e2)}")
-                return []
-        return []
-
-def create_subtitle_clips(transcription, video_width, video_height):
-    """Create TextClips for each transcribed segment"""
-    subtitle_clips = []
-    
-    try:
-        for segment in transcription:
-            start_time = segment["start"]
-            end_time = segment["end"]
-            text = segment["text"]
-            
-            try:
-                txt_clip = (TextClip(text, fontsize=70, color='white', bg_color='black',
-                                   stroke_color='black', stroke_width=2, 
-                                   font='Arial-Bold', method='caption', align='center',
-                                   size=(video_width * 0.9, None))
-                           .set_position(('center', 'bottom'))
-                           .set_start(start_time)
-                           .set_end(end_time))
-            except Exception as e:
-                print(f"Error with default font, trying simplified version: {e}")
-                txt_clip = (TextClip(text, fontsize=60, color='white',
-                                   font='Arial', method='label', align='center')
-                           .set_position(('center', 'bottom'))
-                           .set_start(start_time)
-                           .set_end(end_time))
-            
-            subtitle_clips.append(txt_clip)
-    except Exception as e:
-        print(f"Error creating subtitle clips: {e}")
-    
-    return subtitle_clips
-
-def process_video(input_video, output_video=None, min_silence_len=700, silence_thresh=-35, context_ms=300, pause_ms=500, use_gpu=True, threads=4, fast_mode=True):
-    """
-    Process video by removing silent parts and adding subtitles
-    
-    Args:
-        input_video: Path to input video
-        output_video: Path to output video (optional)
-        min_silence_len: Minimum silence length in milliseconds to be considered silence
-        silence_thresh: Audio level (in dB) below which is considered silence
-        context_ms: Milliseconds of context to add before each speech segment
-        pause_ms: Milliseconds of silence to retain at the end of each segment
-        use_gpu: Whether to use GPU for transcription
-        threads: Number of threads to use for video processing
-        fast_mode: Whether to use faster encoding (lower quality but much faster)
-    """
-    temp_dir = None
-    try:
-        if output_video is None:
-            filename, ext = os.path.splitext(input_video)
-            output_video = f"{filename}_processed{ext}"
-        
-        output_dir = os.path.dirname(os.path.abspath(output_video))
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        
-        print(f"Loading video: {input_video}")
-        video = VideoFileClip(input_video)
-        
-        video_duration = video.duration
-        print(f"Video duration: {video_duration:.2f} seconds")
-        
-        temp_dir = tempfile.mkdtemp()
-        temp_audio_path = os.path.join(temp_dir, "temp_audio.wav")
-        video.audio.write_audiofile(temp_audio_path, codec='pcm_s16le', verbose=False, logger=None)
-        
-        print("Detecting speech segments...")
-        non_silent_ranges = detect_speech_segments(
-            temp_audio_path, 
-            min_silence_len=min_silence_len,
-            silence_thresh=silence_thresh,
-            context_ms=context_ms,
-            pause_ms=pause_ms
-        )
-        
-        bounded_ranges = []
-        for start, end in non_silent_ranges:
-            if end > video_duration:
-                print(f"Warning: Segment end time {end:.2f}s exceeds video duration {video_duration:.2f}s. Clamping to video end.")
-                end = video_duration
-            
-            if start < video_duration and end > start:
-                bounded_ranges.append((start, end))
-        
-        if len(bounded_ranges) != len(non_silent_ranges):
-            print(f"Removed {len(non_silent_ranges) - len(bounded_ranges)} segments that were outside video bounds")
-        
-        print(f"Cutting out silent parts using {len(bounded_ranges)} valid segments...")
-        video_clips = [video.subclip(start, end) for start, end in bounded_ranges]
-        if not video_clips:
-            print("No non-silent parts detected. Check your silence threshold.")
-            return
-        
-        print(f"Concatenating {len(video_clips)} video segments...")
-        final_video = concatenate_videoclips(video_clips)
-        temp_concat_audio = os.path.join(temp_dir, "concat_audio.wav")
-        print("Processing concatenated audio...")
-        
-        if hasattr(final_video.audio, 'write_audiofile'):
-            if not hasattr(final_video.audio, 'fps') or final_video.audio.fps is None:
-                if hasattr(video_clips[0].audio, 'fps') and video_clips[0].audio.fps is not None:
-                    final_video.audio.fps = video_clips[0].audio.fps
-                else:
-                    final_video.audio.fps = 44100
-            
-            final_video.audio.write_audiofile(temp_concat_audio, codec='pcm_s16le', verbose=False, logger=None)
-        else:
-            temp_video_path = os.path.join(temp_dir, "temp_concat.mp4")
-            final_video.write_videofile(temp_video_path, codec="libx264", audio_codec="aac", 
-                                        verbose=False, logger=None, threads=threads, 
-                                        preset='ultrafast' if fast_mode else 'medium')
-            video_with_audio = VideoFileClip(temp_video_path)
-            video_with_audio.audio.write_audiofile(temp_concat_audio, codec='pcm_s16le', verbose=False, logger=None)
-        
-        print("Transcribing audio for subtitles...")
-        try:
-            transcription = transcribe_audio(temp_concat_audio, use_gpu=use_gpu)
-            
-            if not transcription:
-                print("Warning: No transcription generated. Creating video without subtitles.")
-                final_video_with_subs = final_video
-            else:
-                print("Adding subtitles...")
-                subtitle_clips = create_subtitle_clips(
-                    transcription, 
-                    final_video.w, 
-                    final_video.h
-                )
-                
-                if subtitle_clips:
-                    final_video_with_subs = CompositeVideoClip([final_video] + subtitle_clips)
-                else:
-                    print("Warning: Failed to create subtitle clips. Creating video without subtitles.")
-                    final_video_with_subs = final_video
-        except Exception as e:
-            print(f"Error during transcription process: {e}")
-            print("Creating video without subtitles.")
-            final_video_with_subs = final_video       
-
-        print(f"Writing final video to: {output_video}")
-        try:
-            ffmpeg_params = []
-            if fast_mode:
-                base_params = [
-                    '-preset', 'ultrafast',
-                    '-tune', 'fastdecode',
-                    '-crf', '23',
-                    '-b:a', '128k'
-                ]
-                
-                if sys.platform.startswith('win') and use_gpu and torch.cuda.is_available():
-                    cuda_params = [
-                        '-hwaccel', 'cuda',
-                        '-hwaccel_output_format', 'cuda',
-                        '-c:v', 'h264_nvenc'
-                    ]
-                    ffmpeg_params = base_params + cuda_params
-                    print("Using NVIDIA hardware acceleration for encoding")
-                elif sys.platform == 'darwin':
-                    mac_params = [
-                        '-c:v', 'h264_videotoolbox'
-                    ]
-                    ffmpeg_params = base_params + mac_params
-                    print("Using macOS hardware acceleration for encoding")
-                elif sys.platform.startswith('linux') and use_gpu:
-                    try:
-                        vaapi_check = subprocess.run(['vainfo'], capture_output=True, text=True)
-                        if vaapi_check.returncode == 0:
-                            vaapi_params = [
-                                '-vaapi_device', '/dev/dri/renderD128',
-                                '-hwaccel', 'vaapi', 
-                                '-c:v', 'h264_vaapi'
-                            ]
-                            ffmpeg_params = base_params + vaapi_params
-                            print("Using VAAPI hardware acceleration for encoding")
-                        else:
-                            ffmpeg_params = base_params
-                            print("Hardware acceleration not available, using software encoding")
-                    except:
-                        ffmpeg_params = base_params
-                        print("VAAPI not found, using software encoding")
-                else:
-                    ffmpeg_params = base_params
-                    print("Using software encoding")
-            else:
-                ffmpeg_params = [
-                    '-preset', 'slow',
-                    '-crf', '18',
-                    '-b:a', '192k'
-                ]
-            
-            final_video_with_subs.write_videofile(
-                output_video,
-                codec="libx264",
-                audio_codec="aac",
-                threads=threads,  
-                ffmpeg_params=ffmpeg_params,
-                verbose=False,
-                logger=None
-            )
-            print("Successfully created video with subtitles!")
-        except Exception as e:
-            print(f"Error writing final video: {e}")
-            
-            try:
-                print("Attempting to write video without subtitles...")
-                final_video.write_videofile(
-                    output_video,
-                    codec="libx264",
-                    audio_codec="aac",
-                    threads=threads,
-                    ffmpeg_params=ffmpeg_params,
-                    verbose=False,
-                    logger=None
-                )
-                print("Successfully created video without subtitles.")
-            except Exception as e2:
-                print(f"Critical error: Could not write video at all: {e2}")
-                return
-    
-    except Exception as e:
-        print(f"Error processing video: {e}")
-    
-    finally:
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                print("Cleaning up temporary files...")
-                shutil.rmtree(temp_dir)
-            except Exception as cleanup_error:
-                print(f"Error during cleanup: {cleanup_error}")
-        
-        print("Processing complete.")
-
-if __name__ == "__main__":
-    import argparse
-    import multiprocessing
-    
-    cpu_count = multiprocessing.cpu_count()
-    
-    parser = argparse.ArgumentParser(description="Process videos for social media by removing silence and adding subtitles")
-    parser.add_argument("input_video", help="Path to the input video file")
-    parser.add_argument("--output", "-o", help="Path to the output video file")
-    parser.add_argument("--silence-length", "-sl", type=int, default=700, 
-                        help="Minimum silence length in milliseconds to be removed (default: 700)")
-    parser.add_argument("--silence-threshold", "-st", type=int, default=-35, 
-                        help="Audio level (in dB) below which is considered silence (default: -35)")
-    parser.add_argument("--context", "-c", type=int, default=300,
-                        help="Milliseconds of context to add before each speech segment (default: 300)")
-    parser.add_argument("--pause", "-p", type=int, default=500,
-                        help="Milliseconds of silence to keep at the end of each segment (default: 500)")
-    parser.add_argument("--no-gpu", action="store_true", 
-                        help="Disable GPU usage even if available")
-    parser.add_argument("--threads", "-t", type=int, default=cpu_count,
-                        help=f"Number of threads to use for video processing (default: {cpu_count})")
-    parser.add_argument("--high-quality", action="store_true",
-                        help="Use higher quality (slower) encoding")
-    
-    args = parser.parse_args()
-    
-    use_gpu = True
-    if args.no_gpu:
-        use_gpu = False
-    
-    import time
-    start_time = time.time()
-    
-    print(f"Processing with {args.threads} threads, {'GPU' if use_gpu else 'CPU'} transcription, " +
-          f"and {'high quality' if args.high_quality else 'fast'} encoding...")
-    
-    process_video(
-        args.input_video, 
-        args.output, 
-        min_silence_len=args.silence_length, 
-        silence_thresh=args.silence_threshold,
-        context_ms=args.context,
-        pause_ms=args.pause,
-        use_gpu=use_gpu,
-        threads=args.threads,
-        fast_mode=not args.high_quality
-    )
-    
-    elapsed_time = time.time() - start_time
-    print(f"\nTotal processing time: {elapsed_time:.2f} seconds ({elapsed_time/60:.2f} minutes)")
\ No newline at end of file
+import os
+import sys
+import io
+import re
+import argparse
+import contextlib
+import functools
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import numpy as np
+from moviepy.editor import VideoFileClip
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+import tempfile
+import torch  
+import shutil
+from pathlib import Path
+from moviepy.config import get_setting
+import proglog
+from cpus import physical_core_cpus, physical_cpu_count
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+PIPE_BUFFER_SIZE = 1 << 20
+PIPE_READ_SIZE = 1 << 16
+# Whisper and Silero both take 16 kHz mono; decode_audio() resamples to it once for every consumer
+ANALYSIS_SAMPLE_RATE = 16000
+PCM16_SCALE = np.float32(1.0 / 32768.0)
+PROGRESS_PREFIX = "PROGRESS "
+TERMINATE_TIMEOUT = 0.5
+CHILD_NICENESS = 5
+CHILD_IO_PRIORITY = 6
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+DEFAULT_WHISPER_MODEL = "base.en"
+_whisper_models = {}
+_whisper_models_lock = threading.Lock()
+
+if sys.platform.startswith('win'):
+    NO_WINDOW_FLAGS = subprocess.CREATE_NO_WINDOW
+    BACKGROUND_FLAGS = subprocess.CREATE_NO_WINDOW | subprocess.BELOW_NORMAL_PRIORITY_CLASS
+else:
+    NO_WINDOW_FLAGS = BACKGROUND_FLAGS = 0
+
+_SHOWINFO_PTS_TIME = re.compile(rb"pts_time:\s*(-?[\d.]+)")
+_FFMPEG_PROGRESS_LINE = re.compile(rb"^(\w+)=(\S*)$")
+
+
+class ProcessingCanceled(BaseException):
+    """Raised inside the pipeline when the caller's cancel event is set"""
+
+
+class _CallbackWriter(io.TextIOBase):
+    """
+    File-like object that forwards each completed line to a callback
+    
+    Partial lines are buffered per thread, so a line printed by one thread is
+    never split or joined by output from another (e.g. the Whisper thread
+    logging while the main thread reports ffmpeg progress).
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        with self._lock:
+            buffer = getattr(self._local, "buffer", "") + text
+            while "\n" in buffer:
+                line, buffer = buffer.split("\n", 1)
+                self.callback(line.rstrip("\r"))
+            self._local.buffer = buffer
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            buffer = getattr(self._local, "buffer", "")
+            if buffer:
+                self.callback(buffer)
+                self._local.buffer = ""
+
+
+class _PipelineLogger(proglog.ProgressBarLogger):
+    """MoviePy logger that reports write progress and aborts once cancellation is requested"""
+
+    def __init__(self, cancel_event=None):
+        super().__init__()
+        self.cancel_event = cancel_event
+        self._last_percent = None
+
+    def callback(self, **changes):
+        check_canceled(self.cancel_event)
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        check_canceled(self.cancel_event)
+        if attr == "index":
+            total = self.bars[bar].get("total")
+            if total:
+                percent = int(100 * (value + 1) / total)
+                if percent != self._last_percent:
+                    self._last_percent = percent
+                    report_progress(percent)
+
+
+def check_canceled(cancel_event):
+    """Raise ProcessingCanceled if the given event has been set"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise ProcessingCanceled()
+
+
+def report_progress(percent):
+    """Emit a machine-readable progress line for the current stage (0-100)"""
+    print(f"{PROGRESS_PREFIX}{min(max(percent, 0), 100):.0f}")
+
+
+def pin_to_physical_cores(pid):
+    """Restrict a process to one logical CPU per physical core where supported"""
+    cpus = physical_core_cpus()
+    if cpus:
+        try:
+            os.sched_setaffinity(pid, cpus)
+        except OSError as e:
+            print(f"Could not set CPU affinity: {e}")
+
+def ffmpeg_thread_args(threads):
+    """Global ffmpeg options that size the filter graph thread pools"""
+    return ["-filter_threads", str(threads), "-filter_complex_threads", str(threads)]
+
+def lower_process_priority(pid):
+    """
+    Run a child process slightly below normal priority so the GUI stays responsive
+    
+    Windows children get BELOW_NORMAL_PRIORITY_CLASS through BACKGROUND_FLAGS at
+    creation. On POSIX the niceness is raised by CHILD_NICENESS, and on Linux the
+    I/O priority is lowered within the best-effort class when psutil is installed.
+    """
+    if sys.platform.startswith('win'):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, pid, os.getpriority(os.PRIO_PROCESS, 0) + CHILD_NICENESS)
+    except OSError:
+        pass
+    if sys.platform.startswith('linux'):
+        try:
+            import psutil
+        except ImportError:
+            return
+        try:
+            psutil.Process(pid).ionice(psutil.IOPRIO_CLASS_BE, value=CHILD_IO_PRIORITY)
+        except psutil.Error:
+            pass
+
+def terminate_process(process, timeout=TERMINATE_TIMEOUT):
+    """Terminate a child process, killing it if it has not exited after `timeout` seconds"""
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if sys.platform.startswith('win'):
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)], capture_output=True,
+                           creationflags=NO_WINDOW_FLAGS)
+        else:
+            process.kill()
+        process.wait()
+
+def _terminate_on_cancel(process, cancel_event):
+    while process.poll() is None:
+        if cancel_event.wait(0.1):
+            terminate_process(process)
+            return
+
+def _spawn_ffmpeg(cmd, cancel_event=None, threads=None, **popen_kwargs):
+    if popen_kwargs.get("stdin") is None:
+        popen_kwargs["stdin"] = subprocess.DEVNULL
+    process = subprocess.Popen(
+        cmd,
+        bufsize=PIPE_BUFFER_SIZE,
+        creationflags=BACKGROUND_FLAGS,
+        **popen_kwargs
+    )
+    lower_process_priority(process.pid)
+    if threads:
+        pin_to_physical_cores(process.pid)
+    if cancel_event is not None:
+        threading.Thread(target=_terminate_on_cancel, args=(process, cancel_event), daemon=True).start()
+    return process
+
+def run_ffmpeg(args, cancel_event=None, duration=None, threads=None, stdin=None):
+    """
+    Run ffmpeg and stream its console output to stdout line by line
+    
+    The output is read from a raw binary pipe in large chunks and only the
+    completed lines are decoded, instead of going through a line-buffered
+    text-mode pipe.
+    
+    Args:
+        args: ffmpeg arguments (without the binary itself)
+        cancel_event: Optional threading.Event; ffmpeg is terminated when it is set
+        duration: Expected output duration in seconds; when given, ffmpeg's
+            -progress output is parsed and reported via report_progress()
+        threads: Decoder and filter thread count; when given, ffmpeg is also
+            pinned to physical cores (Linux)
+        stdin: Optional pipe read by ffmpeg as "-"; the parent's end is closed
+            once ffmpeg has started so the writer sees a broken pipe if it exits
+    
+    Raises:
+        RuntimeError: If ffmpeg exits with a non-zero return code
+    """
+    cmd = [get_setting("FFMPEG_BINARY"), "-hide_banner", "-nostdin", "-y"]
+    if duration:
+        cmd += ["-progress", "pipe:1", "-nostats"]
+    if threads:
+        cmd += ["-threads", str(threads)] + ffmpeg_thread_args(threads)
+    cmd += list(args)
+    last_percent = None
+    process = _spawn_ffmpeg(cmd, cancel_event, threads, stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    if stdin is not None:
+        stdin.close()
+    
+    try:
+        fd = process.stdout.fileno()
+        pending = bytearray()
+        while True:
+            chunk = os.read(fd, PIPE_READ_SIZE)
+            if not chunk:
+                break
+            pending.extend(chunk.replace(b"\r", b"\n"))
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if not line:
+                    continue
+                match = _FFMPEG_PROGRESS_LINE.match(line) if duration else None
+                if match is None:
+                    print(line.decode("utf-8", errors="replace"))
+                elif match.group(1) in (b"out_time_us", b"out_time_ms") and match.group(2).isdigit():
+                    percent = int(int(match.group(2)) / 1e6 / duration * 100)
+                    if percent != last_percent:
+                        last_percent = percent
+                        report_progress(percent)
+            check_canceled(cancel_event)
+        if pending:
+            print(pending.decode("utf-8", errors="replace"))
+        
+        returncode = process.wait()
+    finally:
+        terminate_process(process)
+        process.stdout.close()
+    
+    check_canceled(cancel_event)
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with return code {returncode}")
+
+def decode_audio(input_path, sample_rate=ANALYSIS_SAMPLE_RATE, cancel_event=None, duration=None):
+    """
+    Decode the audio track of a media file to mono float32 samples through an ffmpeg pipe
+    
+    ffmpeg sends 16-bit PCM, half the bytes of float32, which is read straight
+    into one preallocated buffer sized from `duration` when it is known. The
+    conversion casts to float32 first and then scales in place by a float32
+    reciprocal, so no float64 copy of the track is ever made.
+    
+    Args:
+        input_path: Path to a video or audio file
+        sample_rate: Output sample rate in Hz
+        cancel_event: Optional threading.Event used to cancel processing
+        duration: Expected duration in seconds, used to size the buffer
+    
+    Returns:
+        1-D numpy float32 array in the range [-1, 1]
+    """
+    cmd = [get_setting("FFMPEG_BINARY"), "-hide_banner", "-nostdin", "-loglevel", "error", "-i", input_path,
+           "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "-"]
+    with tempfile.TemporaryFile() as error_log:
+        process = _spawn_ffmpeg(cmd, cancel_event, stdout=subprocess.PIPE, stderr=error_log)
+        sample_size = np.dtype(np.int16).itemsize
+        capacity = int(((duration or 0) + 1) * sample_rate) * sample_size
+        buffer = bytearray(max(capacity, PIPE_BUFFER_SIZE))
+        view = memoryview(buffer)
+        filled = 0
+        try:
+            while True:
+                if filled == len(buffer):
+                    view.release()
+                    buffer.extend(bytes(len(buffer)))
+                    view = memoryview(buffer)
+                count = process.stdout.readinto(view[filled:filled + PIPE_BUFFER_SIZE])
+                if not count:
+                    break
+                filled += count
+            returncode = process.wait()
+        finally:
+            view.release()
+            terminate_process(process)
+            process.stdout.close()
+        
+        check_canceled(cancel_event)
+        if returncode != 0:
+            error_log.seek(0)
+            message = error_log.read().decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"ffmpeg could not decode audio: {message}")
+    
+    samples = np.frombuffer(buffer, dtype=np.int16, count=filled // sample_size).astype(np.float32)
+    samples *= PCM16_SCALE
+    return samples
+
+def _silent_runs_numpy(silent):
+    edges = np.diff(np.concatenate(([0], silent.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+def _silent_runs_kernel(silent, bounds):
+    count = 0
+    in_run = False
+    for i in range(silent.shape[0]):
+        if silent[i] != in_run:
+            bounds[count] = i
+            count += 1
+            in_run = not in_run
+    if in_run:
+        bounds[count] = silent.shape[0]
+        count += 1
+    return count
+
+def _compile_silence_kernel():
+    if njit is None:
+        return None
+    signature = "int64(boolean[::1], int64[::1])"
+    try:
+        return njit(signature, cache=True)(_silent_runs_kernel)
+    except RuntimeError:
+        # Numba cannot locate a cache dir when the source is not on disk, e.g. in a PyInstaller bundle
+        return njit(signature)(_silent_runs_kernel)
+
+_silent_runs_jit = _compile_silence_kernel()
+
+def silent_runs(silent):
+    """Run-length encode a boolean array into (starts, ends) index arrays of its True runs"""
+    if _silent_runs_jit is None:
+        return _silent_runs_numpy(silent)
+    bounds = np.empty(silent.shape[0] + 1, dtype=np.int64)
+    count = _silent_runs_jit(silent, bounds)
+    return bounds[0:count:2], bounds[1:count:2]
+
+def warmup_silence_kernel():
+    """Run the silence run-length kernel once on dummy data so it is loaded before the first job"""
+    silent_runs(np.zeros(1024, dtype=np.bool_))
+
+def detect_silences(samples, sample_rate=ANALYSIS_SAMPLE_RATE, min_silence_len=700, silence_thresh=-35, seek_step=10):
+    """
+    Find silent stretches in mono float32 samples with a sliding-window RMS sweep
+    
+    Energy is summed per seek_step block, and a cumulative sum over the blocks
+    gives every window's energy in O(n). A window is silent when its RMS is
+    below silence_thresh dBFS.
+    
+    Args:
+        samples: 1-D float32 array in the range [-1, 1]
+        sample_rate: Sample rate of `samples` in Hz
+        min_silence_len: Minimum silence length in milliseconds
+        silence_thresh: Audio level (in dB) below which is considered silence
+        seek_step: Step between analysed windows in milliseconds
+    
+    Returns:
+        List of (start, end) tuples in seconds
+    """
+    step = max(1, int(sample_rate * seek_step / 1000))
+    window_blocks = max(1, int(round(min_silence_len / seek_step)))
+    block_count = len(samples) // step
+    if block_count < window_blocks:
+        return []
+    
+    blocks = samples[:block_count * step].reshape(block_count, step)
+    block_energy = np.einsum("ij,ij->i", blocks, blocks)
+    cumulative = np.concatenate(([0.0], np.cumsum(block_energy, dtype=np.float64)))
+    window_energy = cumulative[window_blocks:] - cumulative[:-window_blocks]
+    silent = window_energy < 10 ** (silence_thresh / 10) * window_blocks * step
+    
+    starts, ends = silent_runs(silent)
+    block_seconds = step / sample_rate
+    return [(start * block_seconds, (end - 1 + window_blocks) * block_seconds)
+            for start, end in zip(starts.tolist(), ends.tolist())]
+
+def _frame_features(samples, sample_rate, window, hop, chunk_frames=4096):
+    frame_count = 1 + (len(samples) - window) // hop
+    frames = np.lib.stride_tricks.sliding_window_view(samples, window)[::hop]
+    frequencies = np.fft.rfftfreq(window, 1 / sample_rate).astype(np.float32)
+    energy = np.empty(frame_count, dtype=np.float32)
+    centroid = np.empty(frame_count, dtype=np.float32)
+    for i in range(0, frame_count, chunk_frames):
+        block = frames[i:i + chunk_frames]
+        energy[i:i + len(block)] = np.einsum("ij,ij->i", block, block) / window
+        spectrum = np.abs(np.fft.rfft(block, axis=1), dtype=np.float32)
+        centroid[i:i + len(block)] = spectrum @ frequencies / (spectrum.sum(axis=1) + 1e-10)
+    return energy, centroid
+
+def _histogram_threshold(values, weight):
+    counts, edges = np.histogram(values, bins=min(100, max(10, len(values) // 10)))
+    counts = np.convolve(counts, np.ones(3) / 3, mode="same")
+    peaks = np.flatnonzero((counts[1:-1] > counts[:-2]) & (counts[1:-1] >= counts[2:])) + 1
+    if len(peaks) >= 2:
+        centers = (edges[:-1] + edges[1:]) / 2
+        first, second = centers[peaks[0]], centers[peaks[1]]
+    else:
+        first, second = values.min(), values.mean()
+    return (weight * first + second) / (weight + 1)
+
+def detect_silences_adaptive(samples, sample_rate=ANALYSIS_SAMPLE_RATE, min_silence_len=700, seek_step=10, window_ms=90, weight=5):
+    """
+    Find silent stretches with thresholds learned from the recording itself
+    
+    Short-term energy and spectral centroid are computed over `window_ms` windows
+    every `seek_step` ms. For each feature the first two maxima M1, M2 of its
+    histogram give the threshold (weight * M1 + M2) / (weight + 1). A frame is
+    speech when both features are above their thresholds, so no fixed dB level
+    has to be tuned per recording.
+    
+    Args:
+        samples: 1-D float32 array in the range [-1, 1]
+        sample_rate: Sample rate of `samples` in Hz
+        min_silence_len: Minimum silence length in milliseconds
+        seek_step: Step between analysed windows in milliseconds
+        window_ms: Analysis window length in milliseconds
+        weight: Weight of the first histogram maximum in the thresholds
+    
+    Returns:
+        List of (start, end) tuples in seconds
+    """
+    window = int(sample_rate * window_ms / 1000)
+    hop = max(1, int(sample_rate * seek_step / 1000))
+    if len(samples) < window:
+        return []
+    
+    energy, centroid = _frame_features(samples, sample_rate, window, hop)
+    energy_db = 10 * np.log10(energy + 1e-10)
+    speech = ((energy_db >= _histogram_threshold(energy_db, weight)) &
+              (centroid >= _histogram_threshold(centroid, weight)))
+    
+    starts, ends = silent_runs(~speech)
+    keep = (ends - starts) * seek_step >= min_silence_len
+    return [(start * hop / sample_rate, ((end - 1) * hop + window) / sample_rate)
+            for start, end in zip(starts[keep].tolist(), ends[keep].tolist())]
+
+def detect_silences_silero(samples, sample_rate=ANALYSIS_SAMPLE_RATE, min_silence_len=700):
+    """
+    Find silent stretches with the Silero VAD model bundled with faster-whisper
+    
+    Args:
+        samples: 1-D float32 array sampled at 16 kHz
+        sample_rate: Sample rate of `samples` in Hz (Silero requires 16000)
+        min_silence_len: Minimum silence length in milliseconds
+    
+    Returns:
+        List of (start, end) tuples in seconds
+    """
+    speech = get_speech_timestamps(
+        samples,
+        VadOptions(min_silence_duration_ms=min_silence_len, speech_pad_ms=0),
+        sampling_rate=sample_rate
+    )
+    bounds = [0] + [t for chunk in speech for t in (chunk["start"], chunk["end"])] + [len(samples)]
+    silences = np.asarray(bounds, dtype=np.float64).reshape(-1, 2) / sample_rate
+    return [(start, end) for start, end in silences.tolist() if end > start]
+
+def merge_ranges(starts, ends, max_gap=0.0):
+    """
+    Merge (start, end) ranges that overlap or are at most `max_gap` apart
+    
+    Ranges are sorted by start, a running maximum of the ends marks where a new
+    group begins, and each group keeps its first start and its largest end.
+    
+    Returns:
+        (starts, ends) numpy float64 arrays of the merged ranges in order
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    if not len(starts):
+        return starts, ends
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    run_end = np.maximum.accumulate(ends)
+    group_index = np.flatnonzero(np.concatenate(([True], starts[1:] > run_end[:-1] + max_gap)))
+    return starts[group_index], np.maximum.reduceat(ends, group_index)
+
+def detect_speech_segments(samples, sample_rate=ANALYSIS_SAMPLE_RATE, min_silence_len=700, silence_thresh=-35, context_ms=300, pause_ms=500, seek_step=10, vad="threshold"):
+    """
+    Detect non-silent parts of the audio with added context and smooth transitions
+    
+    Args:
+        samples: Mono float32 samples from decode_audio()
+        sample_rate: Sample rate of `samples` in Hz
+        min_silence_len: Minimum silence length in milliseconds
+        silence_thresh: Audio level (in dB) below which is considered silence
+        context_ms: Milliseconds of context to add before each speech segment
+        pause_ms: Milliseconds of silence to retain at the end of each segment
+        seek_step: Step between analysed windows in milliseconds
+        vad: "threshold" for the fixed silence_thresh level, "adaptive" for
+            detect_silences_adaptive() or "silero" for detect_silences_silero()
+    """
+    duration = len(samples) / sample_rate
+    if vad == "silero":
+        silences = detect_silences_silero(samples, sample_rate, min_silence_len=min_silence_len)
+    elif vad == "adaptive":
+        silences = detect_silences_adaptive(
+            samples,
+            sample_rate,
+            min_silence_len=min_silence_len,
+            seek_step=seek_step
+        )
+    else:
+        silences = detect_silences(
+            samples,
+            sample_rate,
+            min_silence_len=min_silence_len,
+            silence_thresh=silence_thresh,
+            seek_step=seek_step
+        )
+    
+    # Speech lies between consecutive silences; empty gaps (e.g. a leading silence) are dropped
+    bounds = np.concatenate(([0.0], np.asarray(silences, dtype=np.float64).ravel(), [duration]))
+    starts, ends = bounds[0::2], bounds[1::2]
+    voiced = ends > starts
+    starts = np.maximum(starts[voiced] - context_ms / 1000, 0.0)
+    ends = ends[voiced] + pause_ms / 1000
+    
+    # Every silence is already at least min_silence_len long, so only ranges whose padding overlaps are merged
+    starts, ends = merge_ranges(starts, ends)
+    merged_ranges = list(zip(starts.tolist(), ends.tolist()))
+    
+    print(f"Found {len(merged_ranges)} speech segments after merging overlaps and adding smooth transitions")
+    return merged_ranges
+
+def _load_whisper_model(device, compute_type=None, model_name=DEFAULT_WHISPER_MODEL):
+    compute_type = compute_type or ("int8_float16" if device == "cuda" else "int8")
+    key = (model_name, device, compute_type)
+    with _whisper_models_lock:
+        if key not in _whisper_models:
+            _whisper_models[key] = WhisperModel(model_name, device=device, compute_type=compute_type)
+        return _whisper_models[key]
+
+def default_batch_size(device):
+    """Pick a transcription batch size from the available GPU memory; the CPU transcribes sequentially"""
+    if device == "cuda":
+        total_gb = torch.cuda.get_device_properties(0).total_memory / 1e9
+        return max(4, min(32, int(total_gb * 2)))
+    return 1
+
+def _transcribe_segments(model, audio, batch_size=1, cancel_event=None):
+    if batch_size > 1:
+        segments, _ = BatchedInferencePipeline(model=model).transcribe(
+            audio, language="en", beam_size=1, batch_size=batch_size, without_timestamps=False)
+    else:
+        segments, _ = model.transcribe(audio, language="en", beam_size=1, vad_filter=False)
+    transcription = []
+    for segment in segments:
+        check_canceled(cancel_event)
+        transcription.append({"start": segment.start, "end": segment.end, "text": segment.text})
+    return transcription
+
+def transcribe_audio(audio, use_gpu=True, cancel_event=None, batch_size=None, model_name=DEFAULT_WHISPER_MODEL, compute_type=None):
+    """
+    Transcribe audio using faster-whisper with GPU if available
+    
+    `audio` is a file path or a 16 kHz mono float32 array. Arrays from
+    decode_audio() are already at that rate, so faster-whisper uses them as
+    they are without decoding or resampling again.
+    
+    With a batch size above 1 the audio is split into voiced chunks of up to
+    30 seconds that are decoded in batches by BatchedInferencePipeline. Its
+    timestamp tokens are kept, so each chunk still yields sentence-length
+    segments instead of one subtitle per chunk. batch_size defaults to
+    default_batch_size() for the chosen device.
+    
+    model_name is any faster-whisper model size or Hugging Face repository,
+    e.g. "tiny.en", "base.en" or "distil-large-v3". compute_type is a
+    CTranslate2 compute type and defaults to int8_float16 on CUDA and int8 on CPU.
+    """
+    print(f"Loading Whisper model {model_name}...")
+    
+    if use_gpu:
+        try:
+            if torch.cuda.is_available():
+                device = "cuda"
+                torch.cuda.init()
+                print(f"Using GPU: {torch.cuda.get_device_name(0)}")
+                print(f"CUDA Version: {torch.version.cuda}")
+                print(f"GPU Memory: {torch.cuda.get_device_properties(0).total_memory / 1e9:.2f} GB")
+            else:
+                device = "cpu"
+                print("CUDA is not available. Using CPU for transcription.")
+                print(f"PyTorch version: {torch.__version__}")
+        except Exception as e:
+            device = "cpu"
+            print(f"Error initializing GPU: {str(e)}")
+            print("Falling back to CPU for transcription.")
+    else:
+        device = "cpu"
+        print("GPU usage disabled. Using CPU for transcription.")
+    
+    try:
+        model = _load_whisper_model(device, compute_type, model_name)
+        print(f"Model loaded successfully on {device}")
+        
+        device_batch_size = batch_size or default_batch_size(device)
+        print(f"Transcribing audio (batch size {device_batch_size})...")
+        return _transcribe_segments(model, audio, device_batch_size, cancel_event)
+    except ProcessingCanceled:
+        raise
+    except Exception as e:
+        print(f"Error during transcription: {str(e)}")
+        if device == "cuda":
+            print("Attempting fallback to CPU...")
+            try:
+                return _transcribe_segments(_load_whisper_model("cpu", compute_type, model_name), audio,
+                                            batch_size or default_batch_size("cpu"), cancel_event)
+            except ProcessingCanceled:
+                raise
+            except Exception as e2:
+                print(f"CPU fallback also failed: {str(e2)}")
+                return []
+        return []
+
+def _ass_timestamp(seconds):
+    centiseconds = int(round(max(0.0, seconds) * 100))
+    hours, centiseconds = divmod(centiseconds, 360000)
+    minutes, centiseconds = divmod(centiseconds, 6000)
+    return f"{hours}:{minutes:02d}:{centiseconds // 100:02d}.{centiseconds % 100:02d}"
+
+def write_ass_subtitles(transcription, output_path, video_width, video_height):
+    """
+    Write transcribed segments as an ASS subtitle file for ffmpeg's libass-based ass filter
+    
+    Text is white Arial Bold at 70px on an opaque black box, centred at the bottom
+    and wrapped to 90% of the video width.
+    """
+    margin = int(video_width * 0.05)
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {video_width}",
+        f"PlayResY: {video_height}",
+        "WrapStyle: 0",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+        "Alignment, MarginL, MarginR, MarginV, Encoding",
+        f"Style: Default,Arial,70,&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,"
+        f"-1,0,0,0,100,100,0,0,3,2,0,2,{margin},{margin},20,1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    for segment in transcription:
+        text = segment["text"].strip().replace("{", "(").replace("}", ")").replace("\n", "\\N")
+        if text:
+            lines.append(f"Dialogue: 0,{_ass_timestamp(segment['start'])},{_ass_timestamp(segment['end'])},"
+                         f"Default,,0,0,0,,{text}")
+    
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+def ass_filter(subtitle_path):
+    """Build an ass video filter for the given file, escaping the path for the filtergraph parser"""
+    escaped = subtitle_path.replace("\\", "/").replace(":", "\\:").replace("'", "'\\''")
+    return f"ass='{escaped}'"
+
+@functools.lru_cache(maxsize=None)
+def encoder_available(name):
+    """Check whether the ffmpeg build used by MoviePy provides the given encoder"""
+    try:
+        result = subprocess.run([get_setting("FFMPEG_BINARY"), "-hide_banner", "-encoders"],
+                                stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                                creationflags=NO_WINDOW_FLAGS)
+    except OSError:
+        return False
+    return any(line.split()[1:2] == [name] for line in result.stdout.splitlines())
+
+def software_encoder_settings(encoder="libx264", preset=None, fast_mode=True):
+    """
+    Choose the software video encoder settings for the final write
+    
+    Args:
+        encoder: "libx264" or "libsvtav1"
+        preset: Encoder preset; defaults depend on the encoder and fast_mode
+        fast_mode: Whether to favour encoding speed over quality
+    
+    Returns:
+        (codec, preset, ffmpeg_params) tuple
+    """
+    if encoder == "libsvtav1" and not encoder_available("libsvtav1"):
+        print("libsvtav1 is not available in this ffmpeg build, falling back to libx264")
+        encoder, preset = "libx264", None
+    
+    audio_params = ['-b:a', '128k' if fast_mode else '192k']
+    if encoder == "libsvtav1":
+        preset = preset or ('12' if fast_mode else '6')
+        return encoder, preset, ['-crf', '35' if fast_mode else '28', '-pix_fmt', 'yuv420p'] + audio_params
+    
+    if fast_mode:
+        preset = preset or 'ultrafast'
+        # Fixed GOP without B-frames (I-P-P-P) keeps decoding and seeking cheap
+        return encoder, preset, ['-tune', 'fastdecode', '-crf', '23',
+                                 '-g', '30', '-bf', '0', '-sc_threshold', '0'] + audio_params
+    return encoder, preset or 'slow', ['-crf', '18'] + audio_params
+
+def probe_video(path):
+    """Read duration and frame size of a video without opening a frame reader"""
+    infos = ffmpeg_parse_infos(path)
+    return {
+        "duration": infos["duration"],
+        "size": infos.get("video_size"),
+    }
+
+def intermediate_encode_args(fast_mode=True):
+    """Output arguments for the cut video that is re-encoded again in the final write"""
+    return ["-c:v", "libx264", "-preset", 'ultrafast' if fast_mode else 'medium', "-crf", "18",
+            "-c:a", "aac", "-b:a", "192k"]
+
+def _range_microseconds(ranges):
+    """Range bounds as an (n, 2) int64 array of microseconds, the resolution of ffmpeg's trim options"""
+    return np.rint(np.asarray(ranges, dtype=np.float64).reshape(-1, 2) * 1e6).astype(np.int64)
+
+def select_samples(samples, ranges, sample_rate=ANALYSIS_SAMPLE_RATE):
+    """
+    Concatenate the samples that fall inside the given ranges
+    
+    The bounds are the same microsecond values the cut's atrim filters get, and
+    they are rounded to samples the way atrim does: sample n is kept when
+    round(start * sample_rate) <= n < round(end * sample_rate). atrim applies
+    this at the source sample rate, so the two agree to within one sample per
+    bound. The video side of the cut is only frame accurate.
+    """
+    bounds = (_range_microseconds(ranges) * sample_rate + 500000) // 1000000
+    return np.concatenate([samples[a:b] for a, b in bounds.tolist()])
+
+def _trim_concat_filter(ranges):
+    """Filtergraph that trims each range from the video and audio of input 0 and joins them as [v] and [a]"""
+    chains = [f"[0:v]trim=start={start}us:end={end}us,setpts=PTS-STARTPTS[v{i}];"
+              f"[0:a]atrim=start={start}us:end={end}us,asetpts=PTS-STARTPTS[a{i}];"
+              for i, (start, end) in enumerate(_range_microseconds(ranges).tolist())]
+    pads = "".join(f"[v{i}][a{i}]" for i in range(len(ranges)))
+    return "".join(chains) + f"{pads}concat=n={len(ranges)}:v=1:a=1[v][a]"
+
+def cut_segments(input_video, ranges, output_path, threads=4, fast_mode=True, cancel_event=None, input_args=(), show_progress=True):
+    """
+    Cut the given ranges out of the input and join them in a single ffmpeg pass
+    
+    Each range is trimmed from the video and the audio and the pieces are joined
+    with the concat filter, which starts every segment's audio and video together
+    so A/V offsets from frame rounding do not add up across segments. The graph
+    is handed to ffmpeg through -filter_complex_script, so long range lists do
+    not hit command-line length limits.
+    
+    Args:
+        input_video: Path to input video
+        ranges: List of (start, end) tuples in seconds
+        output_path: Path of the joined video
+        threads: ffmpeg thread count
+        fast_mode: Whether to use faster encoding
+        cancel_event: Optional threading.Event used to cancel processing
+        input_args: Extra input options placed before -i, e.g. -ss/-t to read only part
+            of the input (ranges are then relative to the seek position)
+        show_progress: Whether to report ffmpeg's progress
+    """
+    script_path = os.path.splitext(output_path)[0] + "_filter.txt"
+    with open(script_path, "w", encoding="utf-8") as f:
+        f.write(_trim_concat_filter(ranges))
+    
+    run_ffmpeg(
+        list(input_args) + ["-i", input_video, "-filter_complex_script", script_path, "-map", "[v]", "-map", "[a]"] +
+        intermediate_encode_args(fast_mode) + ["-threads", str(threads), output_path],
+        cancel_event,
+        duration=sum(end - start for start, end in ranges) if show_progress else None,
+        threads=threads
+    )
+
+def _concat_entry(path):
+    escaped = path.replace("'", "'\\''")
+    return f"file '{escaped}'\n"
+
+# Input options go before -i; the subtitle filter brings frames to system memory for libass and back
+HARDWARE_CODECS = {
+    "nvenc": {
+        "name": "NVIDIA NVDEC/NVENC",
+        "input_args": ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"],
+        "subtitle_filter": "hwdownload,format=nv12,{},hwupload_cuda",
+        "video_args": ["-c:v", "h264_nvenc", "-preset", "p1", "-tune", "ll", "-rc", "vbr", "-cq", "23", "-b:v", "0"],
+    },
+    "vaapi": {
+        "name": "VAAPI",
+        "input_args": ["-vaapi_device", VAAPI_DEVICE, "-hwaccel", "vaapi", "-hwaccel_output_format", "vaapi"],
+        "subtitle_filter": "hwdownload,format=nv12,{},hwupload",
+        "video_args": ["-c:v", "h264_vaapi", "-qp", "23"],
+    },
+}
+
+def hardware_codec(use_gpu=True):
+    """Pick the HARDWARE_CODECS entry for the final write, or None when encoding in software"""
+    if not use_gpu:
+        return None
+    if torch.cuda.is_available() and encoder_available("h264_nvenc"):
+        return "nvenc"
+    if sys.platform.startswith('linux') and os.path.exists(VAAPI_DEVICE) and encoder_available("h264_vaapi"):
+        return "vaapi"
+    return None
+
+def write_video_software(input_path, output_path, codec, preset=None, codec_params=(), subtitle_path=None, duration=None, threads=None, cancel_event=None, input_args=(), stdin=None):
+    """
+    Encode the final video with a single ffmpeg call instead of piping frames through MoviePy
+    
+    Args:
+        input_path: Path to the cut video, or "-" to read it from `stdin`
+        output_path: Path to the final video
+        codec: ffmpeg video encoder name
+        preset: Optional encoder preset
+        codec_params: Further output options, e.g. from software_encoder_settings()
+        subtitle_path: Optional ASS file to burn in
+        duration: Output duration in seconds, used for progress reporting
+        threads: ffmpeg thread count for decoding, filtering and encoding
+        cancel_event: Optional threading.Event used to cancel processing
+        input_args: Extra input options placed before -i, e.g. the format of a piped input
+        stdin: Optional pipe the input is read from
+    """
+    args = list(input_args) + ["-i", input_path]
+    if subtitle_path:
+        args += ["-vf", ass_filter(subtitle_path)]
+    args += ["-c:v", codec] + (["-preset", str(preset)] if preset else []) + list(codec_params)
+    args += ["-c:a", "aac"] + (["-threads", str(threads)] if threads else []) + [output_path]
+    run_ffmpeg(args, cancel_event, duration=duration, threads=threads, stdin=stdin)
+
+def write_video_streamed(input_video, ranges, output_path, temp_dir, codec, preset=None, codec_params=(), subtitle_path=None, threads=4, cancel_event=None):
+    """
+    Cut the ranges and encode the final video in one go, with no intermediate cut video
+    
+    A decoder ffmpeg process applies the same trim/concat graph as cut_segments()
+    and writes raw yuv420p frames and PCM audio as a NUT stream to its stdout,
+    which write_video_software() reads directly. Nothing but the final video is
+    written to disk and the cut is encoded only once, at the cost of pipe buffers
+    in RAM. The subtitles must be ready before the pipeline starts, so the cut
+    does not overlap transcription.
+    
+    Args:
+        input_video: Path to input video
+        ranges: List of (start, end) tuples in seconds
+        output_path: Path to the final video
+        temp_dir: Directory for the filter script
+        codec: ffmpeg video encoder name
+        preset: Optional encoder preset
+        codec_params: Further output options, e.g. from software_encoder_settings()
+        subtitle_path: Optional ASS file to burn in
+        threads: ffmpeg thread count for each of the two processes
+        cancel_event: Optional threading.Event used to cancel processing
+    """
+    script_path = os.path.join(temp_dir, "stream_filter.txt")
+    with open(script_path, "w", encoding="utf-8") as f:
+        f.write(_trim_concat_filter(ranges))
+    
+    decoder = _spawn_ffmpeg(
+        [get_setting("FFMPEG_BINARY"), "-hide_banner", "-nostdin", "-loglevel", "error",
+         "-threads", str(threads), "-i", input_video, "-filter_complex_script", script_path,
+         "-map", "[v]", "-map", "[a]", "-c:v", "rawvideo", "-pix_fmt", "yuv420p", "-c:a", "pcm_s16le",
+         "-f", "nut", "-"],
+        cancel_event,
+        threads,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        write_video_software(
+            "-",
+            output_path,
+            codec,
+            preset,
+            codec_params,
+            subtitle_path,
+            duration=sum(end - start for start, end in ranges),
+            threads=threads,
+            cancel_event=cancel_event,
+            input_args=["-f", "nut"],
+            stdin=decoder.stdout
+        )
+        returncode = decoder.wait()
+    finally:
+        terminate_process(decoder)
+    
+    check_canceled(cancel_event)
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg decoder exited with return code {returncode}")
+
+def write_video_hardware(input_path, output_path, hardware, subtitle_path=None, duration=None, threads=None, fast_mode=True, cancel_event=None):
+    """
+    Encode the final video in one ffmpeg call with hardware decoding and encoding
+    
+    Decoded frames stay in GPU memory and are only copied to system memory and
+    back when subtitles have to be burned in.
+    
+    Args:
+        input_path: Path to the cut video
+        output_path: Path to the final video
+        hardware: Key of HARDWARE_CODECS
+        subtitle_path: Optional ASS file to burn in
+        duration: Output duration in seconds, used for progress reporting
+        threads: ffmpeg thread count for decoding, filtering and encoding
+        fast_mode: Whether to use a lower audio bitrate
+        cancel_event: Optional threading.Event used to cancel processing
+    """
+    codec = HARDWARE_CODECS[hardware]
+    args = codec["input_args"] + ["-i", input_path]
+    if subtitle_path:
+        args += ["-vf", codec["subtitle_filter"].format(ass_filter(subtitle_path))]
+    args += codec["video_args"] + ["-c:a", "aac", "-b:a", '128k' if fast_mode else '192k']
+    args += (["-threads", str(threads)] if threads else []) + [output_path]
+    run_ffmpeg(args, cancel_event, duration=duration, threads=threads)
+
+def keyframe_times(input_video, cancel_event=None):
+    """
+    List the timestamps of the video keyframes, decoding only the keyframes
+    
+    Returns:
+        Sorted numpy float64 array of keyframe times in seconds
+    """
+    cmd = [get_setting("FFMPEG_BINARY"), "-hide_banner", "-nostdin", "-nostats", "-skip_frame", "nokey", "-i", input_video,
+           "-an", "-vf", "showinfo", "-f", "null", "-"]
+    process = _spawn_ffmpeg(cmd, cancel_event, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        output = process.stderr.read()
+        returncode = process.wait()
+    finally:
+        terminate_process(process)
+        process.stderr.close()
+    
+    check_canceled(cancel_event)
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with return code {returncode} while reading keyframes")
+    return np.array(sorted(float(t) for t in _SHOWINFO_PTS_TIME.findall(output)), dtype=np.float64)
+
+def snap_ranges_to_keyframes(ranges, keyframes):
+    """Move each range start back to the closest keyframe at or before it and merge ranges that now overlap"""
+    starts, ends = np.asarray(ranges, dtype=np.float64).reshape(-1, 2).T
+    index = np.maximum(np.searchsorted(keyframes, starts, side="right") - 1, 0)
+    starts = np.minimum(starts, keyframes[index]) if len(keyframes) else starts
+    starts, ends = merge_ranges(starts, ends)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+def cut_segments_copy(input_video, ranges, output_path, cancel_event=None):
+    """
+    Join the given ranges with ffmpeg's concat demuxer and stream copy, without re-encoding
+    
+    The ranges should start on keyframes (see snap_ranges_to_keyframes), otherwise
+    the first frames of a segment cannot be decoded.
+    
+    Args:
+        input_video: Path to input video
+        ranges: List of (start, end) tuples in seconds
+        output_path: Path of the joined video
+        cancel_event: Optional threading.Event used to cancel processing
+    """
+    list_path = os.path.splitext(output_path)[0] + "_segments.txt"
+    source = _concat_entry(os.path.abspath(input_video))
+    with open(list_path, "w", encoding="utf-8") as f:
+        for start, end in ranges:
+            f.write(f"{source}inpoint {start:.6f}\noutpoint {end:.6f}\n")
+    
+    run_ffmpeg(
+        ["-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy", "-avoid_negative_ts", "make_zero", output_path],
+        cancel_event,
+        duration=sum(end - start for start, end in ranges)
+    )
+
+def encode_segments_parallel(input_video, ranges, temp_dir, workers, threads=4, fast_mode=True, cancel_event=None):
+    """
+    Split the ranges into `workers` shards of similar total length, cut and encode the
+    shards concurrently, then join the parts with ffmpeg's concat demuxer without
+    re-encoding
+    
+    Each shard is one cut_segments() pass that seeks to the shard's first range, so
+    the number of ffmpeg processes does not grow with the number of ranges and no
+    shard decodes the parts of the input that belong to another one.
+    
+    Args:
+        input_video: Path to input video
+        ranges: List of (start, end) tuples in seconds
+        temp_dir: Directory for the part files and the joined video
+        workers: Number of shards encoded at the same time
+        threads: Total ffmpeg thread budget shared by the workers
+        fast_mode: Whether to use faster encoding for the parts
+        cancel_event: Optional threading.Event used to cancel processing
+    
+    Returns:
+        Path to the joined video
+    """
+    workers = min(workers, len(ranges))
+    threads_per_worker = max(1, threads // workers)
+    
+    durations = np.array([end - start for start, end in ranges], dtype=np.float64)
+    offsets = np.cumsum(durations) - durations
+    shard_of = np.minimum((offsets / durations.sum() * workers).astype(np.int64), workers - 1)
+    boundaries = (np.flatnonzero(np.diff(shard_of)) + 1).tolist()
+    shards = [ranges[a:b] for a, b in zip([0] + boundaries, boundaries + [len(ranges)])]
+    part_paths = [os.path.join(temp_dir, f"part_{i:05d}.mp4") for i in range(len(shards))]
+    # Set when any shard fails or the user cancels, so the other shards' ffmpeg processes stop at once
+    stop_shards = threading.Event()
+    
+    def encode_part(shard, part_path):
+        offset, end = shard[0][0], shard[-1][1]
+        cut_segments(
+            input_video,
+            [(start - offset, stop - offset) for start, stop in shard],
+            part_path,
+            threads=threads_per_worker,
+            fast_mode=fast_mode,
+            cancel_event=stop_shards,
+            input_args=["-ss", f"{offset:.3f}", "-t", f"{end - offset:.3f}"],
+            show_progress=False
+        )
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(encode_part, shard, part_path)
+                   for shard, part_path in zip(shards, part_paths)]
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                if done:
+                    report_progress(100 * (len(futures) - len(pending)) / len(futures))
+                check_canceled(cancel_event)
+        except BaseException:
+            stop_shards.set()
+            for future in futures:
+                future.cancel()
+            raise
+    
+    list_path = os.path.join(temp_dir, "parts.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        for part_path in part_paths:
+            f.write(_concat_entry(part_path))
+    
+    joined_path = os.path.join(temp_dir, "joined.mp4")
+    run_ffmpeg(["-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy", joined_path], cancel_event)
+    return joined_path
+
+def process_video(input_video, output_video=None, min_silence_len=700, silence_thresh=-35, context_ms=300, pause_ms=500, use_gpu=True, threads=4, fast_mode=True, cancel_event=None, ffmpeg_threads=None, parallel_segments=1, encoder=None, preset=None, seek_step=10, stream_pipeline=False, video_info=None, batch_size=None, copy_cut=False, whisper_model=DEFAULT_WHISPER_MODEL, compute_type=None, vad="threshold", backend="ffmpeg"):
+    """
+    Process video by removing silent parts and adding subtitles
+    
+    Args:
+        input_video: Path to input video
+        output_video: Path to output video (optional)
+        min_silence_len: Minimum silence length in milliseconds to be considered silence
+        silence_thresh: Audio level (in dB) below which is considered silence
+        context_ms: Milliseconds of context to add before each speech segment
+        pause_ms: Milliseconds of silence to retain at the end of each segment
+        use_gpu: Whether to use GPU for transcription
+        threads: Number of threads to use for video processing
+        fast_mode: Whether to use faster encoding (lower quality but much faster)
+        cancel_event: Optional threading.Event; when set, processing stops with ProcessingCanceled
+        ffmpeg_threads: Thread count for ffmpeg decoding, filtering and encoding (defaults to threads)
+        parallel_segments: Number of shards of speech segments to encode concurrently (1 cuts in a single ffmpeg pass)
+        encoder: Software video encoder, "libx264" or "libsvtav1"; when None, a hardware
+            encoder is picked if available and libx264 otherwise
+        preset: Encoder preset (defaults depend on encoder and fast_mode)
+        seek_step: Step between analysed windows in the silence scan, in milliseconds
+        stream_pipeline: Pipe the cut from a decoder ffmpeg straight into a software final encode
+            instead of writing an intermediate cut video (ffmpeg backend, not with copy_cut)
+        video_info: Already known probe_video() result for the input; the input is probed when omitted
+        batch_size: Transcription batch size (defaults to one based on available GPU memory, 1 on CPU)
+        copy_cut: Cut with stream copy, moving segment starts back to keyframes, instead of re-encoding
+        whisper_model: faster-whisper model used for the subtitles
+        compute_type: CTranslate2 compute type for the Whisper model (defaults depend on the device)
+        vad: Silence detection mode, "threshold", "adaptive" or "silero"
+        backend: "ffmpeg" to encode the final video with a direct ffmpeg call, on a
+            hardware encoder when one is available (falling back to MoviePy on failure),
+            or "moviepy" to always use MoviePy
+
+    Returns:
+        True if an output video was written, False otherwise
+    """
+    temp_dir = None
+    transcriber = None
+    transcription_stop = threading.Event()
+    logger = _PipelineLogger(cancel_event)
+    ffmpeg_threads = ffmpeg_threads or threads
+    try:
+        if output_video is None:
+            filename, ext = os.path.splitext(input_video)
+            output_video = f"{filename}_processed{ext}"
+        
+        output_dir = os.path.dirname(os.path.abspath(output_video))
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        
+        print(f"Loading video: {input_video}")
+        if video_info is None:
+            video_info = probe_video(input_video)
+        video_duration = video_info["duration"]
+        print(f"Video duration: {video_duration:.2f} seconds")
+        
+        temp_dir = tempfile.mkdtemp()
+        
+        print("Decoding audio...")
+        samples = decode_audio(input_video, ANALYSIS_SAMPLE_RATE, cancel_event, duration=video_duration)
+        
+        print("Detecting speech segments...")
+        non_silent_ranges = detect_speech_segments(
+            samples,
+            ANALYSIS_SAMPLE_RATE,
+            min_silence_len=min_silence_len,
+            silence_thresh=silence_thresh,
+            context_ms=context_ms,
+            pause_ms=pause_ms,
+            seek_step=seek_step,
+            vad=vad
+        )
+        
+        bounded_ranges = []
+        for start, end in non_silent_ranges:
+            if end > video_duration:
+                print(f"Warning: Segment end time {end:.2f}s exceeds video duration {video_duration:.2f}s. Clamping to video end.")
+                end = video_duration
+            
+            if start < video_duration and end > start:
+                bounded_ranges.append((start, end))
+        
+        if len(bounded_ranges) != len(non_silent_ranges):
+            print(f"Removed {len(non_silent_ranges) - len(bounded_ranges)} segments that were outside video bounds")
+        
+        if not bounded_ranges:
+            print("No non-silent parts detected. Check your silence threshold.")
+            return False
+        
+        if copy_cut:
+            print("Aligning segments to keyframes...")
+            bounded_ranges = snap_ranges_to_keyframes(bounded_ranges, keyframe_times(input_video, cancel_event))
+        
+        speech_audio = select_samples(samples, bounded_ranges, ANALYSIS_SAMPLE_RATE)
+        del samples
+        
+        print("Transcribing audio for subtitles in the background...")
+        transcriber = ThreadPoolExecutor(max_workers=1)
+        transcription_future = transcriber.submit(
+            transcribe_audio,
+            speech_audio,
+            use_gpu=use_gpu,
+            cancel_event=transcription_stop,
+            batch_size=batch_size,
+            model_name=whisper_model,
+            compute_type=compute_type
+        )
+        
+        stream_cut = stream_pipeline and not copy_cut and backend == "ffmpeg"
+        if stream_cut:
+            print(f"Cutting {len(bounded_ranges)} valid segments straight into the final encode once the subtitles are ready")
+        else:
+            print(f"Cutting out silent parts using {len(bounded_ranges)} valid segments...")
+        if copy_cut:
+            joined_path = os.path.join(temp_dir, "joined" + os.path.splitext(input_video)[1])
+            cut_segments_copy(input_video, bounded_ranges, joined_path, cancel_event)
+        elif stream_cut:
+            joined_path = None
+        elif parallel_segments > 1 and len(bounded_ranges) > 1:
+            print(f"Encoding {len(bounded_ranges)} video segments in up to {parallel_segments} parallel shards...")
+            joined_path = encode_segments_parallel(
+                input_video,
+                bounded_ranges,
+                temp_dir,
+                parallel_segments,
+                threads=ffmpeg_threads,
+                fast_mode=fast_mode,
+                cancel_event=cancel_event
+            )
+        else:
+            joined_path = os.path.join(temp_dir, "joined.mp4")
+            cut_segments(
+                input_video,
+                bounded_ranges,
+                joined_path,
+                threads=ffmpeg_threads,
+                fast_mode=fast_mode,
+                cancel_event=cancel_event
+            )
+        if not transcription_future.done():
+            print("Waiting for transcription to finish...")
+        while not wait([transcription_future], timeout=0.1).done:
+            check_canceled(cancel_event)
+        
+        subtitle_path = None
+        try:
+            transcription = transcription_future.result()
+            
+            if not transcription:
+                print("Warning: No transcription generated. Creating video without subtitles.")
+            else:
+                print("Adding subtitles...")
+                subtitle_path = os.path.join(temp_dir, "subtitles.ass")
+                width, height = video_info["size"]
+                write_ass_subtitles(transcription, subtitle_path, width, height)
+        except ProcessingCanceled:
+            raise
+        except Exception as e:
+            print(f"Error during transcription process: {e}")
+            print("Creating video without subtitles.")
+            subtitle_path = None
+
+        check_canceled(cancel_event)
+        print(f"Writing final video to: {output_video}")
+        output_duration = sum(end - start for start, end in bounded_ranges)
+        if joined_path is None:
+            stream_codec, stream_preset, stream_params = software_encoder_settings(encoder or "libx264", preset, fast_mode)
+            print(f"Using software encoding ({stream_codec}) through the stream pipeline")
+            try:
+                write_video_streamed(
+                    input_video,
+                    bounded_ranges,
+                    output_video,
+                    temp_dir,
+                    stream_codec,
+                    stream_preset,
+                    stream_params,
+                    subtitle_path,
+                    threads=ffmpeg_threads,
+                    cancel_event=cancel_event
+                )
+                print("Successfully created video with subtitles!" if subtitle_path else "Successfully created video without subtitles.")
+                return True
+            except ProcessingCanceled:
+                raise
+            except Exception as e:
+                print(f"Stream pipeline failed ({e}), cutting to a temporary file instead")
+                joined_path = os.path.join(temp_dir, "joined.mp4")
+                cut_segments(
+                    input_video,
+                    bounded_ranges,
+                    joined_path,
+                    threads=ffmpeg_threads,
+                    fast_mode=fast_mode,
+                    cancel_event=cancel_event
+                )
+        
+        hardware = hardware_codec(use_gpu) if fast_mode and backend == "ffmpeg" and encoder is None else None
+        if hardware:
+            print(f"Using {HARDWARE_CODECS[hardware]['name']} hardware acceleration for decoding and encoding")
+            try:
+                write_video_hardware(
+                    joined_path,
+                    output_video,
+                    hardware,
+                    subtitle_path,
+                    duration=output_duration,
+                    threads=ffmpeg_threads,
+                    fast_mode=fast_mode,
+                    cancel_event=cancel_event
+                )
+                print("Successfully created video with subtitles!" if subtitle_path else "Successfully created video without subtitles.")
+                return True
+            except ProcessingCanceled:
+                raise
+            except Exception as e:
+                print(f"Hardware encoding failed ({e}), falling back to software encoding")
+        
+        codec, preset, ffmpeg_params = software_encoder_settings(encoder or "libx264", preset, fast_mode)
+        video_codec = codec
+        if fast_mode and encoder is None and sys.platform == 'darwin':
+            video_codec = 'h264_videotoolbox'
+            print("Using macOS hardware acceleration for encoding")
+        elif fast_mode:
+            print(f"Using software encoding ({codec})")
+        else:
+            print(f"Using software encoding ({codec}, preset {preset})")
+        
+        if backend == "ffmpeg":
+            try:
+                write_video_software(
+                    joined_path,
+                    output_video,
+                    video_codec,
+                    preset if video_codec == codec else None,
+                    ffmpeg_params,
+                    subtitle_path,
+                    duration=output_duration,
+                    threads=ffmpeg_threads,
+                    cancel_event=cancel_event
+                )
+                print("Successfully created video with subtitles!" if subtitle_path else "Successfully created video without subtitles.")
+                return True
+            except ProcessingCanceled:
+                raise
+            except Exception as e:
+                print(f"ffmpeg encoding failed ({e}), falling back to MoviePy")
+        
+        final_video = VideoFileClip(joined_path)
+        if video_codec != codec:
+            ffmpeg_params = ffmpeg_params + ['-c:v', video_codec]
+        ffmpeg_params += ffmpeg_thread_args(ffmpeg_threads)
+        try:
+            subtitle_params = ['-vf', ass_filter(subtitle_path)] if subtitle_path else []
+            final_video.write_videofile(
+                output_video,
+                codec=codec,
+                audio_codec="aac",
+                preset=preset,
+                threads=ffmpeg_threads,  
+                ffmpeg_params=ffmpeg_params + subtitle_params,
+                verbose=False,
+                logger=logger
+            )
+            print("Successfully created video with subtitles!" if subtitle_path else "Successfully created video without subtitles.")
+        except ProcessingCanceled:
+            raise
+        except Exception as e:
+            print(f"Error writing final video: {e}")
+            if not subtitle_path:
+                return False
+            
+            try:
+                print("Attempting to write video without subtitles...")
+                final_video.write_videofile(
+                    output_video,
+                    codec=codec,
+                    audio_codec="aac",
+                    preset=preset,
+                    threads=ffmpeg_threads,
+                    ffmpeg_params=ffmpeg_params,
+                    verbose=False,
+                    logger=logger
+                )
+                print("Successfully created video without subtitles.")
+            except ProcessingCanceled:
+                raise
+            except Exception as e2:
+                print(f"Critical error: Could not write video at all: {e2}")
+                return False
+        
+        return True
+    
+    except Exception as e:
+        print(f"Error processing video: {e}")
+        return False
+    
+    finally:
+        transcription_stop.set()
+        if transcriber is not None:
+            transcriber.shutdown(wait=False)
+        
+        if temp_dir and os.path.exists(temp_dir):
+            try:
+                print("Cleaning up temporary files...")
+                shutil.rmtree(temp_dir)
+            except Exception as cleanup_error:
+                print(f"Error during cleanup: {cleanup_error}")
+        
+        print("Processing complete.")
+
+def _frame_size(value):
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value!r}")
+    return [width, height]
+
+def build_parser():
+    """Build the command-line argument parser shared by the CLI and the GUI"""
+    cpu_count = physical_cpu_count()
+    
+    parser = argparse.ArgumentParser(description="Process videos for social media by removing silence and adding subtitles")
+    parser.add_argument("input_video", help="Path to the input video file")
+    parser.add_argument("--output", "-o", help="Path to the output video file")
+    parser.add_argument("--silence-length", "-sl", type=int, default=700, 
+                        help="Minimum silence length in milliseconds to be removed (default: 700)")
+    parser.add_argument("--silence-threshold", "-st", type=int, default=-35, 
+                        help="Audio level (in dB) below which is considered silence (default: -35)")
+    parser.add_argument("--context", "-c", type=int, default=300,
+                        help="Milliseconds of context to add before each speech segment (default: 300)")
+    parser.add_argument("--pause", "-p", type=int, default=500,
+                        help="Milliseconds of silence to keep at the end of each segment (default: 500)")
+    parser.add_argument("--seek-step", type=int, default=10,
+                        help="Step between analysed windows in the silence scan, in milliseconds (default: 10)")
+    parser.add_argument("--vad", choices=["threshold", "adaptive", "silero"], default="threshold",
+                        help="Silence detection: fixed --silence-threshold level, thresholds adapted to the recording, or the Silero VAD model (default: threshold)")
+    parser.add_argument("--no-gpu", action="store_true", 
+                        help="Disable GPU usage even if available")
+    parser.add_argument("--threads", "-t", type=int, default=cpu_count,
+                        help=f"Number of threads to use for video processing (default: {cpu_count})")
+    parser.add_argument("--ffmpeg-threads", type=int,
+                        help="Number of threads for ffmpeg decoding, filtering and encoding (default: same as --threads)")
+    parser.add_argument("--parallel-segments", type=int, default=1,
+                        help="Number of shards of speech segments to encode concurrently before joining them (default: 1, single pass)")
+    parser.add_argument("--copy-cut", action="store_true",
+                        help="Cut with stream copy instead of re-encoding; segment starts move back to the previous keyframe")
+    parser.add_argument("--stream-pipeline", action="store_true",
+                        help="Pipe the cut straight into a software final encode instead of writing an intermediate video (uses more RAM)")
+    parser.add_argument("--encoder", choices=["libx264", "libsvtav1"],
+                        help="Software video encoder for the final video (default: a hardware encoder if available, otherwise libx264)")
+    parser.add_argument("--preset",
+                        help="Encoder preset, e.g. 'ultrafast'/'slow' for libx264 or 0-13 for libsvtav1 (default: depends on quality mode)")
+    parser.add_argument("--backend", choices=["ffmpeg", "moviepy"], default="ffmpeg",
+                        help="Write the final video with a direct ffmpeg call or through MoviePy (default: ffmpeg, MoviePy is the fallback)")
+    parser.add_argument("--high-quality", action="store_true",
+                        help="Use higher quality (slower) encoding")
+    parser.add_argument("--model", default=DEFAULT_WHISPER_MODEL,
+                        help=f"Whisper model for transcription, e.g. tiny.en, base.en, small.en, distil-small.en, distil-large-v3 (default: {DEFAULT_WHISPER_MODEL})")
+    parser.add_argument("--compute-type",
+                        choices=["int8", "int8_float16", "int8_float32", "float16", "bfloat16", "float32"],
+                        help="Whisper weight/compute precision (default: int8_float16 on GPU, int8 on CPU)")
+    parser.add_argument("--batch-size", type=int,
+                        help="Number of 30-second audio chunks transcribed at once; 1 disables batching (default: based on GPU memory, 1 on CPU)")
+    parser.add_argument("--duration-hint", type=float,
+                        help="Known input duration in seconds; with --size-hint the input is not probed again")
+    parser.add_argument("--size-hint", type=_frame_size,
+                        help="Known input frame size as WIDTHxHEIGHT")
+    return parser
+
+def run(args, log_callback=None, cancel_event=None):
+    """
+    Run the full pipeline for parsed command-line arguments
+    
+    Args:
+        args: argparse.Namespace as produced by build_parser()
+        log_callback: Optional callable receiving each output line instead of stdout/stderr
+        cancel_event: Optional threading.Event used to cancel processing
+    
+    Returns:
+        True if the output video was written successfully
+    """
+    if log_callback is None:
+        return _run(args, cancel_event)
+    
+    writer = _CallbackWriter(log_callback)
+    with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+        try:
+            return _run(args, cancel_event)
+        finally:
+            writer.flush()
+
+def _run(args, cancel_event):
+    use_gpu = not args.no_gpu
+    
+    start_time = time.time()
+    
+    print(f"Processing with {args.threads} threads, {'GPU' if use_gpu else 'CPU'} transcription, " +
+          f"and {'high quality' if args.high_quality else 'fast'} encoding...")
+    
+    video_info = None
+    if args.duration_hint and args.size_hint:
+        video_info = {"duration": args.duration_hint, "size": args.size_hint}
+    
+    try:
+        success = process_video(
+            args.input_video, 
+            args.output, 
+            min_silence_len=args.silence_length, 
+            silence_thresh=args.silence_threshold,
+            context_ms=args.context,
+            pause_ms=args.pause,
+            use_gpu=use_gpu,
+            threads=args.threads,
+            fast_mode=not args.high_quality,
+            cancel_event=cancel_event,
+            ffmpeg_threads=args.ffmpeg_threads,
+            parallel_segments=args.parallel_segments,
+            encoder=args.encoder,
+            preset=args.preset,
+            seek_step=args.seek_step,
+            stream_pipeline=args.stream_pipeline,
+            video_info=video_info,
+            batch_size=args.batch_size,
+            copy_cut=args.copy_cut,
+            whisper_model=args.model,
+            compute_type=args.compute_type,
+            vad=args.vad,
+            backend=args.backend
+        )
+    except ProcessingCanceled:
+        print("Processing canceled.")
+        return False
+    
+    elapsed_time = time.time() - start_time
+    print(f"\nTotal processing time: {elapsed_time:.2f} seconds ({elapsed_time/60:.2f} minutes)")
+    return success
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    sys.exit(0 if run(args) else 1)